@@ -1,11 +1,204 @@
 # backend/app.py
-from flask import Flask, render_template
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import Flask, render_template, request, abort, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TEMPLATE_DIR = os.getenv("TEMPLATE_DIR", "/app/templates")
+STATIC_DIR = os.getenv("STATIC_DIR", "/app/static")
+
+# URL prefix -> directory. Vite writes fingerprinted bundles to <templates>/assets.
+ASSET_ROOTS = {
+    "assets": os.path.join(TEMPLATE_DIR, "assets"),
+    "static": STATIC_DIR,
+}
+
+# vite.config.js names every file under assets/ "[name]-[hash].[ext]" with an 8 char hash.
+VITE_HASHED = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+HASHED_PREFIX = "assets"
+COMPRESSIBLE = ("text/", "application/javascript", "application/json",
+                "application/xml", "image/svg+xml", "application/wasm")
+MIN_COMPRESS_SIZE = 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+app = Flask(__name__, template_folder=TEMPLATE_DIR, static_folder=None)
+
+
+class Asset:
+    __slots__ = ("mimetype", "cache_control", "variants", "path", "stat")
+
+    def __init__(self, mimetype, cache_control, variants, path, stat):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        # encoding -> (body, etag)
+        self.variants = variants
+        self.path = path
+        # (mtime_ns, size) of the file the variants were built from
+        self.stat = stat
+
+
+def _compressible(mimetype):
+    return mimetype.startswith(COMPRESSIBLE)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _is_fingerprinted(prefix, name, digest):
+    # Only names that change whenever the content does may be cached forever.
+    if prefix == HASHED_PREFIX and VITE_HASHED.search(name):
+        return True
+    return digest[:8] in os.path.basename(name)
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _build_asset(path, prefix, name):
+    stat = _file_stat(path)
+    data = _read(path)
+    mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    variants = {"identity": (data, digest)}
+
+    if _compressible(mimetype) and len(data) >= MIN_COMPRESS_SIZE:
+        # Prefer files precompressed at build time, fall back to compressing now.
+        br = _read(path + ".br") if os.path.exists(path + ".br") else (
+            brotli.compress(data, quality=11) if brotli else None)
+        gz = _read(path + ".gz") if os.path.exists(path + ".gz") else (
+            gzip.compress(data, compresslevel=9, mtime=0))
+        if br and len(br) < len(data):
+            variants["br"] = (br, digest + "-br")
+        if gz and len(gz) < len(data):
+            variants["gzip"] = (gz, digest + "-gz")
+
+    cache_control = IMMUTABLE if _is_fingerprinted(prefix, name, digest) else REVALIDATE
+    return Asset(mimetype, cache_control, variants, path, stat)
+
+
+def _roots_signature():
+    sig = []
+    for root in ASSET_ROOTS.values():
+        try:
+            sig.append(os.stat(root).st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def load_assets():
+    assets = {}
+    for prefix, root in ASSET_ROOTS.items():
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith((".br", ".gz")):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                assets[f"{prefix}/{name}"] = _build_asset(path, prefix, name)
+    return assets
+
+
+_assets = load_assets()
+_assets_signature = _roots_signature()
+_assets_lock = threading.Lock()
+
+
+def get_asset(key):
+    global _assets, _assets_signature
+    asset = _assets.get(key)
+    if asset is None and _roots_signature() != _assets_signature:
+        # A new build landed after startup; rescan once.
+        with _assets_lock:
+            signature = _roots_signature()
+            if signature != _assets_signature:
+                _assets = load_assets()
+                _assets_signature = signature
+        asset = _assets.get(key)
+    if asset is not None and asset.cache_control == REVALIDATE and _file_stat(asset.path) != asset.stat:
+        # Unhashed files can be edited in place; never answer 304 for old bytes.
+        asset = _refresh_asset(key)
+    return asset
+
+
+def _refresh_asset(key):
+    with _assets_lock:
+        asset = _assets.get(key)
+        if asset is None:
+            return None
+        stat = _file_stat(asset.path)
+        if stat is None:
+            del _assets[key]
+            return None
+        if stat != asset.stat:
+            prefix, name = key.split("/", 1)
+            asset = _assets[key] = _build_asset(asset.path, prefix, name)
+        return asset
+
+
+def _choose_encoding(asset):
+    # Range requests are only honoured on the identity representation.
+    if request.range is not None:
+        return "identity"
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in asset.variants and accepted[encoding] > 0:
+            return encoding
+    return "identity"
+
+
+def serve_asset(key):
+    asset = get_asset(key)
+    if asset is None:
+        abort(404)
+
+    encoding = _choose_encoding(asset)
+    body, etag = asset.variants[encoding]
+    response = Response(body, mimetype=asset.mimetype)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = asset.cache_control
+    if len(asset.variants) > 1:
+        response.vary.add("Accept-Encoding")
+    if encoding != "identity":
+        response.content_encoding = encoding
+        return response.make_conditional(request)
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
+
+
+@app.route("/assets/<path:filename>")
+def assets(filename):
+    return serve_asset(f"assets/{filename}")
+
+
+@app.route("/static/<path:filename>")
+def static(filename):
+    return serve_asset(f"static/{filename}")
 
-app = Flask(__name__, template_folder='/app/templates', static_folder='/app/static')
 
 @app.route("/")
 def home():
-    return render_template("index.html")
+    response = app.make_response(render_template("index.html"))
+    response.headers["Cache-Control"] = REVALIDATE
+    response.add_etag()
+    return response.make_conditional(request)
+
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=False)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=5000, debug=False)
@@ -1,4 +1,14 @@
-from fastapi import FastAPI
+import json
+from typing import Dict
+
+from fastapi import Depends, FastAPI, Form, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+
+import mailguard
+from results import (
+    CertResult, CheckResult, EmailConfig, MXLookup, NSLookup, PortResult, RBLResult, RecordSet, dumps,
+)
+from schemas import ErrorResponse
 
 app = FastAPI()
 
@@ -8,4 +18,111 @@ def hello():
 
 @app.get("/hello")
 def say_hello():
-    return {"detail": "হ্যালো বিশ্ব!"}
\ No newline at end of file
+    return {"detail": "হ্যালো বিশ্ব!"}
+
+# --- mailguard checks ---
+class ResultResponse(Response):
+    """Encodes results.py dataclasses with the same msgspec encoder as mailguard-pro."""
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+def documented(model):
+    return {200: {"model": model}, 400: {"model": ErrorResponse}, 429: {"model": ErrorResponse}}
+
+class CheckRejected(Exception):
+    def __init__(self, status_code, error):
+        self.status_code = status_code
+        self.error = error
+
+@app.exception_handler(CheckRejected)
+async def check_rejected(request: Request, exc: CheckRejected):
+    return JSONResponse({"error": exc.error}, status_code=exc.status_code)
+
+def admit(query, client):
+    """Applies the /check_all query validation and per-IP rate limit to any check."""
+    query = query.strip()
+    error = mailguard.validate_query(query)
+    if error:
+        raise CheckRejected(400, error)
+    wait = mailguard.rate_limit_wait(client.host if client else "")
+    if wait:
+        raise CheckRejected(429, f"Too many requests from your IP. Please try again in {wait} seconds.")
+    return query
+
+def admitted_target(request: Request):
+    # Every /check/* route has exactly one path parameter: the host, domain or IP.
+    target, = request.path_params.values()
+    return admit(target, request.client)
+
+@app.post("/check_all", response_class=ResultResponse, responses=documented(CheckResult))
+async def check_all(request: Request, query: str = Form("")):
+    return ResultResponse(await mailguard.run_check_all(admit(query, request.client)))
+
+@app.get("/check/mx/{domain}", response_class=ResultResponse, responses=documented(MXLookup))
+async def check_mx(domain: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.get_mx_records(domain))
+
+@app.get("/check/ns/{domain}", response_class=ResultResponse, responses=documented(NSLookup))
+async def check_ns(domain: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.get_ns_records_with_ips(domain))
+
+@app.get("/check/dns/{domain}", response_class=ResultResponse, responses=documented(Dict[str, RecordSet]))
+async def check_dns(domain: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.get_all_dns_records(domain))
+
+@app.get("/check/email_config/{domain}", response_class=ResultResponse, responses=documented(EmailConfig))
+async def check_email_config(domain: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.get_email_config_records(domain))
+
+@app.get("/check/rbl/{ip}", response_class=ResultResponse, responses=documented(Dict[str, RBLResult]))
+async def check_rbl(ip: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.check_ip_on_rbls(ip))
+
+@app.get("/check/ptr/{ip}", response_class=ResultResponse, responses=documented(RecordSet))
+async def check_ptr(ip: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.check_reverse_dns(ip))
+
+@app.get("/check/ports/{host}", response_class=ResultResponse, responses=documented(Dict[str, PortResult]))
+async def check_ports(host: str = Depends(admitted_target)):
+    return ResultResponse(await mailguard.scan_common_ports(host))
+
+@app.get("/check/ssl/{host}", response_class=ResultResponse, responses=documented(CertResult))
+async def check_ssl(host: str = Depends(admitted_target), port: int = 443):
+    if port not in mailguard.COMMON_PORTS.values():
+        raise CheckRejected(400, f"Port must be one of {sorted(mailguard.COMMON_PORTS.values())}.")
+    return ResultResponse(await mailguard.check_ssl_certificate(host, port))
+
+@app.websocket("/ws/check")
+async def check_ws(websocket: WebSocket):
+    """
+    Send {"query": "..."}; receives one {"type": "progress"} message per finished
+    check, then {"type": "result"} with the full /check_all payload.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "error": 'Expected a JSON object like {"query": "example.com"}.'})
+                continue
+            try:
+                query = admit(str(message.get("query", "")), websocket.client)
+            except CheckRejected as e:
+                await websocket.send_json({"type": "error", "error": e.error})
+                continue
+
+            done = []
+
+            async def on_progress(name, result):
+                done.append(name)
+                await websocket.send_text(dumps({"type": "progress", "check": name, "done": len(done), "result": result}).decode())
+
+            results = await mailguard.run_check_all(query, on_progress)
+            await websocket.send_text(dumps({"type": "result", "data": results}).decode())
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,72 @@
+"""
+Fires the same /check_all workload at the Flask (mailguard-pro) and FastAPI services
+and prints throughput and latency for each.
+
+    python loadtest.py --flask http://localhost:5000 --fastapi http://localhost:8000 \
+        --requests 500 --concurrency 200 --query example.com
+
+Both services rate limit /check_all per client IP; raise RATE_LIMIT_COUNT on each
+before running, otherwise most requests come back 429.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run(base_url, query, total, concurrency):
+    latencies = []
+    statuses = {}
+    slots = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        async def one():
+            async with slots:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/check_all", data={"query": query})
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "max": latencies[-1],
+        "statuses": statuses,
+    }
+
+
+def report(name, stats):
+    print(f"{name:8} {stats['rps']:8.1f} req/s  p50 {stats['p50']:6.2f}s  "
+          f"p95 {stats['p95']:6.2f}s  max {stats['max']:6.2f}s  {stats['statuses']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--flask", default="http://localhost:5000")
+    parser.add_argument("--fastapi", default="http://localhost:8000")
+    parser.add_argument("--query", default="example.com")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    for name, url in (("flask", args.flask), ("fastapi", args.fastapi)):
+        if url:
+            report(name, await run(url, args.query, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,353 @@
+import os
+import asyncio
+import errno
+import ipaddress
+import ssl
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import dns.asyncresolver
+import dns.resolver
+import dns.reversename
+
+# Async port of the checks in mailguard-pro/app.py. results.py is a copy of
+# mailguard-pro/results.py so both services share one schema.
+from results import (
+    LookupStatus, ListingStatus, PortStatus, CertStatus,
+    RecordSet, MXRecord, MXLookup, NSRecord, NSLookup, RBLResult, EmailConfig,
+    PortResult, CertResult, CheckResult, calculate_health_score,
+)
+
+# --- Configuration ---
+RBL_SERVERS = os.getenv('RBL_SERVERS', "zen.spamhaus.org,bl.spamcop.net,cbl.abuseat.org,b.barracudacentral.org").split(',')
+RBL_SERVERS = [rbl.strip() for rbl in RBL_SERVERS if rbl.strip()]
+
+RATE_LIMIT_COUNT = int(os.getenv('RATE_LIMIT_COUNT', 10))
+RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', 60))
+request_timestamps = defaultdict(list)
+
+COMMON_DKIM_SELECTORS = os.getenv('COMMON_DKIM_SELECTORS', "default,20200519,google,k1,selector1,mail,m1").split(',')
+COMMON_DKIM_SELECTORS = [s.strip() for s in COMMON_DKIM_SELECTORS if s.strip()]
+
+# Caps open sockets across all in-flight checks sharing the event loop
+MAX_OPEN_SOCKETS = int(os.getenv('MAX_OPEN_SOCKETS', 1000))
+
+COMMON_PORTS = {
+    "SMTP": 25,
+    "SMTPS": 465,
+    "Submission": 587,
+    "HTTP": 80,
+    "HTTPS": 443
+}
+
+resolver = dns.asyncresolver.Resolver()
+_socket_slots = None
+
+
+def socket_slots():
+    global _socket_slots
+    if _socket_slots is None:
+        _socket_slots = asyncio.Semaphore(MAX_OPEN_SOCKETS)
+    return _socket_slots
+
+
+# --- Rate Limiting ---
+def rate_limit_wait(client_ip):
+    """Returns seconds to wait if the client is over the limit, otherwise records the request."""
+    current_time = time.time()
+    request_timestamps[client_ip] = [
+        ts for ts in request_timestamps[client_ip]
+        if current_time - ts < RATE_LIMIT_WINDOW
+    ]
+    if len(request_timestamps[client_ip]) >= RATE_LIMIT_COUNT:
+        time_to_wait = RATE_LIMIT_WINDOW - (current_time - request_timestamps[client_ip][0])
+        if time_to_wait > 0:
+            return int(time_to_wait)
+    request_timestamps[client_ip].append(current_time)
+    return 0
+
+
+# --- DNS Utility Functions ---
+async def resolve_dns_record(query_target, record_type, timeout=2):
+    """Resolves a specific DNS record type."""
+    try:
+        answers = await resolver.resolve(query_target, record_type, lifetime=timeout)
+        return RecordSet(LookupStatus.OK, tuple(str(a) for a in answers))
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        return RecordSet(LookupStatus.MISSING, error=f"No {record_type} record found for {query_target}: {e}")
+    except Exception as e:
+        return RecordSet(LookupStatus.ERROR, error=f"Error fetching {record_type} record for {query_target}: {e}")
+
+
+async def _check_rbl(reversed_ip, rbl):
+    try:
+        answers = await resolver.resolve(f"{reversed_ip}.{rbl}", 'A', lifetime=1)
+        return RBLResult(ListingStatus.LISTED, tuple(str(a) for a in answers))
+    except dns.resolver.NXDOMAIN:
+        return RBLResult(ListingStatus.NOT_LISTED)
+    except Exception as e:
+        return RBLResult(ListingStatus.ERROR, error=f"Query timed out or error: {e}")
+
+
+async def check_ip_on_rbls(ip_address):
+    """Checks if an IP address is listed on various RBLs."""
+    reversed_ip = ".".join(reversed(ip_address.split(".")))
+    results = await asyncio.gather(*(_check_rbl(reversed_ip, rbl) for rbl in RBL_SERVERS))
+    return dict(zip(RBL_SERVERS, results))
+
+
+async def get_mx_records(domain):
+    """Fetches and parses MX records."""
+    mx_raw = await resolve_dns_record(domain, 'MX')
+    if mx_raw.status is not LookupStatus.OK:
+        return MXLookup(mx_raw.status, error=mx_raw.error)
+
+    records = []
+    unparsed = []
+    for record in mx_raw.records:
+        try:
+            preference, exchange = record.split(' ', 1)
+            records.append(MXRecord(int(preference), exchange.strip('.')))
+        except ValueError:
+            unparsed.append(record)
+
+    error = f"Could not parse MX record(s): {', '.join(unparsed)}" if unparsed else None
+    if not records:
+        return MXLookup(LookupStatus.ERROR, error=error)
+    records.sort(key=lambda r: r.preference)
+    return MXLookup(LookupStatus.OK, tuple(records), error)
+
+
+async def get_all_dns_records(domain):
+    """Fetches common DNS records for a domain (A, AAAA, CNAME, TXT, NS, SOA)."""
+    record_types = ['A', 'AAAA', 'CNAME', 'TXT', 'NS', 'SOA']
+    answers = await asyncio.gather(*(resolve_dns_record(domain, t) for t in record_types))
+    return {t.lower(): a for t, a in zip(record_types, answers)}
+
+
+async def _ns_with_ips(ns_server_name_raw):
+    ns_server_clean = ns_server_name_raw.strip('.')
+    a_records, aaaa_records = await asyncio.gather(
+        resolve_dns_record(ns_server_clean, 'A'),
+        resolve_dns_record(ns_server_clean, 'AAAA'),
+    )
+    return NSRecord(ns_server_clean, a_records.records + aaaa_records.records)
+
+
+async def get_ns_records_with_ips(domain):
+    """Fetches NS records and resolves their corresponding IP addresses."""
+    ns_servers = await resolve_dns_record(domain, 'NS')
+    if ns_servers.status is not LookupStatus.OK:
+        return NSLookup(ns_servers.status, error=ns_servers.error)
+    records = await asyncio.gather(*(_ns_with_ips(ns) for ns in ns_servers.records))
+    return NSLookup(LookupStatus.OK, tuple(records))
+
+
+def _filter_records(result, marker, missing_message):
+    """Keeps records containing `marker`; a successful lookup without any becomes MISSING."""
+    if result.status is not LookupStatus.OK:
+        return result
+    matching = tuple(r for r in result.records if marker in r.lower())
+    if not matching:
+        return RecordSet(LookupStatus.MISSING, error=missing_message)
+    return RecordSet(LookupStatus.OK, matching)
+
+
+async def get_email_config_records(domain):
+    """Fetches SPF, DKIM, and DMARC DNS records."""
+    spf_results, dmarc_results, *dkim_answers = await asyncio.gather(
+        resolve_dns_record(domain, 'TXT'),
+        resolve_dns_record(f"_dmarc.{domain}", 'TXT'),
+        *(resolve_dns_record(f"{s}._domainkey.{domain}", 'TXT') for s in COMMON_DKIM_SELECTORS),
+    )
+
+    spf = _filter_records(spf_results, 'v=spf1', "No SPF record found (v=spf1 not present in TXT records).")
+
+    dkim_records = []
+    dkim_errors = []
+    for selector, dkim_results in zip(COMMON_DKIM_SELECTORS, dkim_answers):
+        if dkim_results.status is LookupStatus.ERROR:
+            dkim_errors.append(f"Selector '{selector}': {dkim_results.error}")
+        dkim_records.extend(f"Selector '{selector}': {r}" for r in dkim_results.records if 'p=' in r.lower())
+
+    if dkim_records:
+        dkim = RecordSet(LookupStatus.OK, tuple(dkim_records))
+    elif dkim_errors and len(dkim_errors) == len(COMMON_DKIM_SELECTORS):
+        dkim = RecordSet(LookupStatus.ERROR, error="; ".join(dkim_errors))
+    else:
+        dkim = RecordSet(LookupStatus.MISSING, error="No DKIM record found using common selectors.")
+
+    dmarc = _filter_records(dmarc_results, 'v=dmarc1', "No DMARC record found.")
+
+    return EmailConfig(spf, dkim, dmarc)
+
+
+async def check_reverse_dns(ip_address):
+    """Checks the PTR record for an IP address."""
+    try:
+        addr = dns.reversename.from_address(ip_address)
+        ptr_records = await resolver.resolve(addr, 'PTR', lifetime=2)
+        return RecordSet(LookupStatus.OK, tuple(str(p).strip('.') for p in ptr_records))
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        return RecordSet(LookupStatus.MISSING, error=f"No PTR record found for {ip_address}: {e}")
+    except Exception as e:
+        return RecordSet(LookupStatus.ERROR, error=f"Error fetching PTR record for {ip_address}: {e}")
+
+
+# --- Network Checks ---
+async def resolve_host(host):
+    """
+    Returns an address to connect to for host (first A, then AAAA record), or None.
+    Resolving here keeps asyncio.open_connection off the blocking getaddrinfo thread pool.
+    """
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    for record_type in ('A', 'AAAA'):
+        answer = await resolve_dns_record(host, record_type)
+        if answer.records:
+            return answer.records[0]
+    return None
+
+
+async def perform_port_scan(address, port):
+    """Attempts to connect to a specific port on an IP address."""
+    if address is None:
+        return PortResult(port, PortStatus.UNRESOLVED, "Hostname could not be resolved")
+    async with socket_slots():
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout=1)
+            writer.close()
+            return PortResult(port, PortStatus.OPEN)
+        except asyncio.TimeoutError:
+            return PortResult(port, PortStatus.FILTERED, f"Error Code: {errno.EAGAIN}")
+        except ConnectionRefusedError:
+            return PortResult(port, PortStatus.CLOSED)
+        except OSError as e:
+            if e.errno:
+                return PortResult(port, PortStatus.FILTERED, f"Error Code: {e.errno}")
+            return PortResult(port, PortStatus.ERROR, f"Socket error: {e}")
+        except Exception as e:
+            return PortResult(port, PortStatus.ERROR, f"Socket error: {e}")
+
+
+async def scan_common_ports(target_host, address=None):
+    address = address or await resolve_host(target_host)
+    results = await asyncio.gather(*(perform_port_scan(address, p) for p in COMMON_PORTS.values()))
+    return dict(zip(COMMON_PORTS, results))
+
+
+async def check_ssl_certificate(host, port=443, address=None):
+    """Checks SSL/TLS certificate details for a given host and port."""
+    address = address or await resolve_host(host)
+    if address is None:
+        return CertResult(CertStatus.ERROR, error="Hostname could not be resolved for SSL check.")
+    async with socket_slots():
+        try:
+            context = ssl.create_default_context()
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, port, ssl=context, server_hostname=host), timeout=2)
+            cert = writer.get_extra_info('peercert')
+            writer.close()
+
+            subject = dict(x[0] for x in cert['subject'])
+            issuer = dict(x[0] for x in cert['issuer'])
+            not_before = datetime.strptime(cert['notBefore'], '%b %d %H:%M:%S %Y %Z')
+            not_after = datetime.strptime(cert['notAfter'], '%b %d %H:%M:%S %Y %Z')
+            now = datetime.now()
+
+            status = CertStatus.VALID
+            if now < not_before:
+                status = CertStatus.NOT_YET_VALID
+            elif now > not_after:
+                status = CertStatus.EXPIRED
+
+            return CertResult(
+                status=status,
+                common_name=subject.get('commonName', 'N/A'),
+                issuer=issuer.get('commonName', 'N/A'),
+                not_before=not_before.strftime("%Y-%m-%d %H:%M:%S"),
+                not_after=not_after.strftime("%Y-%m-%d %H:%M:%S"),
+                expires_in_days=(not_after - now).days,
+            )
+        except ssl.SSLError as e:
+            return CertResult(CertStatus.ERROR, error=f"SSL Error: {e}")
+        except asyncio.TimeoutError:
+            return CertResult(CertStatus.ERROR, error="Connection timed out during SSL handshake.")
+        except ConnectionRefusedError:
+            return CertResult(CertStatus.ERROR, error="Connection refused. Port might be closed or service not running.")
+        except Exception as e:
+            return CertResult(CertStatus.ERROR, error=f"An unexpected error occurred during SSL check: {e}")
+
+
+def validate_query(query):
+    """Returns an error message for an unusable query, same rules as the Flask service."""
+    if not query:
+        return "অনুগ্রহ করে একটি IP অ্যাড্রেস অথবা ডোমেইন দিন।"
+    if not ('.' in query and query.count('.') >= 1) and not query.count('.') == 3:
+        return "অনুগ্রহ করে একটি বৈধ IP অ্যাড্রেস অথবা ডোমেইন দিন।"
+    return None
+
+
+async def run_check_all(query, on_progress=None):
+    """
+    Runs every check for an IP or domain concurrently and returns the /check_all CheckResult.
+    on_progress(name, result) is awaited as each check finishes.
+    """
+    try:
+        ipaddress.ip_address(query)
+        results = CheckResult(query=query, is_ip=True)
+        checks = {
+            "blacklist_results": check_ip_on_rbls(query),
+            "ptr_records": check_reverse_dns(query),
+        }
+        results.message = f"'{query}' একটি IP অ্যাড্রেস। ব্ল্যাকলিস্ট, PTR এবং পোর্ট চেক করা হয়েছে।"
+    except ValueError:
+        results = CheckResult(query=query, is_ip=False)
+        checks = {
+            "mx_records": get_mx_records(query),
+            "ns_records": get_ns_records_with_ips(query),
+            "all_dns_records": get_all_dns_records(query),
+            "email_config": get_email_config_records(query),
+        }
+        results.message = f"'{query}' একটি ডোমেইন। সকল প্রাসঙ্গিক রেকর্ড এবং সার্ভিস চেক করা হয়েছে।"
+    address = None
+
+    async def scan_ports():
+        # One A/AAAA lookup per check, shared by the port scan and the SSL check.
+        nonlocal address
+        address = await resolve_host(query)
+        return await scan_common_ports(query, address)
+
+    checks["port_scan_results"] = scan_ports()
+
+    async def named(name, coro):
+        return name, await coro
+
+    tasks = [asyncio.create_task(named(n, c)) for n, c in checks.items()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            name, value = await finished
+            setattr(results, name, value)
+            if on_progress:
+                await on_progress(name, value)
+    finally:
+        # Nothing awaits the remaining checks once on_progress fails (client gone).
+        for task in tasks:
+            task.cancel()
+
+    # SSL Certificate Check (only for domains with HTTPS open; a bare IP has no hostname to verify)
+    if results.port_scan_results["HTTPS"].status is not PortStatus.OPEN:
+        results.ssl_cert_results = CertResult(CertStatus.SKIPPED, error="HTTPS port not open or not applicable.")
+    elif results.is_ip:
+        results.ssl_cert_results = CertResult(CertStatus.SKIPPED, error="HTTPS port is open, but IP is not resolvable to a hostname for SSL check.")
+    else:
+        results.ssl_cert_results = await check_ssl_certificate(query, address=address)
+    if on_progress:
+        await on_progress("ssl_cert_results", results.ssl_cert_results)
+
+    results.health_score = calculate_health_score(results)
+    return results
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+# Check responses use the dataclasses in mailguard-pro/results.py (see mailguard.py).
+
+
+class ErrorResponse(BaseModel):
+    error: str
@@ -0,0 +1,208 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+import msgspec
+
+# Typed /check_all result. Failures are carried in `status` fields instead of
+# "Error fetching ..." strings, so scoring and the UI never scan text.
+# The FastAPI service keeps an identical copy in fastapi/results.py so it deploys
+# on its own; both services return the same schema and score it the same way.
+# mailguard-pro/tests/test_results.py fails if the copies drift apart.
+
+
+class LookupStatus(str, Enum):
+    OK = "ok"
+    MISSING = "missing"   # NXDOMAIN / no answer / no matching record
+    ERROR = "error"       # timeout, SERVFAIL, unexpected failure
+
+
+class ListingStatus(str, Enum):
+    LISTED = "listed"
+    NOT_LISTED = "not_listed"
+    ERROR = "error"
+
+
+class PortStatus(str, Enum):
+    OPEN = "open"
+    CLOSED = "closed"
+    FILTERED = "filtered"
+    UNRESOLVED = "unresolved"
+    ERROR = "error"
+
+
+class CertStatus(str, Enum):
+    VALID = "valid"
+    NOT_YET_VALID = "not_yet_valid"
+    EXPIRED = "expired"
+    ERROR = "error"
+    SKIPPED = "skipped"
+
+
+@dataclass(slots=True)
+class RecordSet:
+    status: LookupStatus
+    records: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MXRecord:
+    preference: int
+    exchange: str
+
+
+@dataclass(slots=True)
+class MXLookup:
+    status: LookupStatus
+    records: Tuple[MXRecord, ...] = ()
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class NSRecord:
+    name: str
+    ips: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class NSLookup:
+    status: LookupStatus
+    records: Tuple[NSRecord, ...] = ()
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class RBLResult:
+    status: ListingStatus
+    details: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class EmailConfig:
+    spf: RecordSet
+    dkim: RecordSet
+    dmarc: RecordSet
+
+
+@dataclass(slots=True)
+class PortResult:
+    port: int
+    status: PortStatus
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CertResult:
+    status: CertStatus
+    common_name: Optional[str] = None
+    issuer: Optional[str] = None
+    not_before: Optional[str] = None
+    not_after: Optional[str] = None
+    expires_in_days: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class HealthScore:
+    score: int = 0
+    issues: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class CheckResult:
+    query: str
+    is_ip: bool
+    message: str = ""
+    blacklist_results: Dict[str, RBLResult] = field(default_factory=dict)
+    ptr_records: Optional[RecordSet] = None
+    mx_records: Optional[MXLookup] = None
+    ns_records: Optional[NSLookup] = None
+    all_dns_records: Dict[str, RecordSet] = field(default_factory=dict)
+    email_config: Optional[EmailConfig] = None
+    port_scan_results: Dict[str, PortResult] = field(default_factory=dict)
+    ssl_cert_results: Optional[CertResult] = None
+    health_score: HealthScore = field(default_factory=HealthScore)
+
+
+# --- Scoring ---
+def calculate_health_score(results):
+    """
+    Calculates a simple health score based on various checks.
+    Higher score is better.
+    """
+    score = 100 # Max score
+    issues = []
+
+    # Blacklist Check (for IPs)
+    if results.is_ip:
+        listed_count = sum(1 for rbl in results.blacklist_results.values() if rbl.status is ListingStatus.LISTED)
+        if listed_count > 0:
+            score -= (listed_count * 10) # Deduct 10 points per listing
+            issues.append(f"{listed_count} RBL listings found.")
+
+    # Email Configuration Checks (for Domains)
+    email_cfg = results.email_config
+    if not results.is_ip and email_cfg:
+        if email_cfg.spf.status is not LookupStatus.OK:
+            score -= 15
+            issues.append("Missing or invalid SPF record.")
+
+        if email_cfg.dkim.status is not LookupStatus.OK:
+            score -= 15
+            issues.append("Missing or invalid DKIM record.")
+
+        if email_cfg.dmarc.status is not LookupStatus.OK:
+            score -= 10
+            issues.append("Missing or invalid DMARC record.")
+        elif 'p=none' in email_cfg.dmarc.records[0].lower(): # Weak DMARC policy
+            score -= 5
+            issues.append("DMARC policy is set to 'p=none', which is weak.")
+
+    # Reverse DNS (PTR) check (for IPs)
+    if results.is_ip and results.ptr_records and results.ptr_records.status is not LookupStatus.OK:
+        score -= 10
+        issues.append("Missing or invalid Reverse DNS (PTR) record.")
+
+    # Port scan check (for domains/IPs)
+    ports = results.port_scan_results
+    if ports:
+        open_ports = {name for name, p in ports.items() if p.status is PortStatus.OPEN}
+        if not open_ports & {"SMTP", "Submission"}:
+            score -= 5
+            issues.append("Common SMTP/Submission ports (25/587) are not open.")
+
+        if "HTTPS" not in open_ports and not results.is_ip: # Only for domains, or if IP is likely a web server
+            score -= 3
+            issues.append("HTTPS port (443) is not open for web services.")
+
+    # SSL Certificate Check
+    cert = results.ssl_cert_results
+    if cert and cert.status is CertStatus.EXPIRED:
+        score -= 10
+        issues.append("SSL/TLS certificate is expired.")
+    elif cert and cert.status is CertStatus.ERROR:
+        score -= 5
+        issues.append(f"SSL/TLS certificate check failed: {cert.error or ''}")
+    elif cert and cert.expires_in_days is not None and cert.expires_in_days < 30:
+        score -= 5
+        issues.append(f"SSL/TLS certificate expires in less than 30 days ({cert.expires_in_days} days).")
+
+    # Ensure score doesn't go below 0
+    return HealthScore(max(0, score), tuple(issues))
+
+
+# --- Serialization ---
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder(CheckResult)
+
+
+def dumps(result):
+    """Encodes a CheckResult (or any part of one) to JSON bytes."""
+    return _encoder.encode(result)
+
+
+def loads(data):
+    """Decodes JSON bytes produced by dumps() back into a CheckResult."""
+    return _decoder.decode(data)
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from results import (
+    CertResult, CertStatus, CheckResult, EmailConfig, ListingStatus, LookupStatus, MXLookup, MXRecord,
+    NSLookup, NSRecord, PortResult, PortStatus, RBLResult, RecordSet, calculate_health_score, dumps, loads,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def all_ports(status):
+    return {name: PortResult(port, status) for name, port in
+            [("SMTP", 25), ("SMTPS", 465), ("Submission", 587), ("HTTP", 80), ("HTTPS", 443)]}
+
+
+def healthy_domain():
+    return CheckResult(
+        query="example.com",
+        is_ip=False,
+        mx_records=MXLookup(LookupStatus.OK, (MXRecord(10, "mx.example.com"),), "Could not parse MX record(s): bad"),
+        ns_records=NSLookup(LookupStatus.OK, (NSRecord("ns1.example.com", ("192.0.2.1",)),)),
+        all_dns_records={"a": RecordSet(LookupStatus.OK, ("192.0.2.10",)), "cname": RecordSet(LookupStatus.MISSING, error="none")},
+        email_config=EmailConfig(
+            spf=RecordSet(LookupStatus.OK, ("v=spf1 -all",)),
+            dkim=RecordSet(LookupStatus.OK, ("Selector 'default': v=DKIM1; p=abc",)),
+            dmarc=RecordSet(LookupStatus.OK, ("v=DMARC1; p=reject",)),
+        ),
+        port_scan_results=all_ports(PortStatus.OPEN),
+        ssl_cert_results=CertResult(CertStatus.VALID, "example.com", "Example CA", expires_in_days=90),
+    )
+
+
+def test_dumps_loads_round_trip():
+    result = healthy_domain()
+    result.health_score = calculate_health_score(result)
+
+    assert loads(dumps(result)) == result
+
+
+def test_round_trip_keeps_ip_results():
+    result = CheckResult(
+        query="192.0.2.1",
+        is_ip=True,
+        blacklist_results={"zen.spamhaus.org": RBLResult(ListingStatus.LISTED, ("127.0.0.2",)),
+                           "bl.spamcop.net": RBLResult(ListingStatus.ERROR, error="timeout")},
+        ptr_records=RecordSet(LookupStatus.MISSING, error="No PTR record"),
+        port_scan_results=all_ports(PortStatus.FILTERED),
+        ssl_cert_results=CertResult(CertStatus.SKIPPED, error="HTTPS port not open or not applicable."),
+    )
+
+    decoded = loads(dumps(result))
+    assert decoded == result
+    assert decoded.blacklist_results["zen.spamhaus.org"].status is ListingStatus.LISTED
+
+
+def test_statuses_serialize_as_strings():
+    assert dumps(PortResult(25, PortStatus.OPEN)) == b'{"port":25,"status":"open","error":null}'
+
+
+def test_healthy_domain_scores_full_marks():
+    assert calculate_health_score(healthy_domain()).score == 100
+
+
+@pytest.mark.parametrize("status", [LookupStatus.MISSING, LookupStatus.ERROR])
+def test_missing_or_failed_email_records_are_penalised(status):
+    result = healthy_domain()
+    result.email_config = EmailConfig(RecordSet(status), RecordSet(status), RecordSet(status))
+
+    score = calculate_health_score(result)
+    assert score.score == 100 - 15 - 15 - 10
+    assert len(score.issues) == 3
+
+
+def test_weak_dmarc_policy():
+    result = healthy_domain()
+    result.email_config.dmarc = RecordSet(LookupStatus.OK, ("v=DMARC1; p=none",))
+
+    assert calculate_health_score(result).score == 95
+
+
+def test_rbl_errors_are_not_listings():
+    result = CheckResult(
+        query="192.0.2.1",
+        is_ip=True,
+        blacklist_results={"a": RBLResult(ListingStatus.LISTED), "b": RBLResult(ListingStatus.ERROR),
+                           "c": RBLResult(ListingStatus.NOT_LISTED)},
+        ptr_records=RecordSet(LookupStatus.OK, ("mail.example.com",)),
+        port_scan_results=all_ports(PortStatus.OPEN),
+    )
+
+    score = calculate_health_score(result)
+    assert score.score == 90
+    assert score.issues == ("1 RBL listings found.",)
+
+
+def test_closed_ports_and_certificate_problems():
+    result = healthy_domain()
+    result.port_scan_results = all_ports(PortStatus.CLOSED)
+    result.ssl_cert_results = CertResult(CertStatus.EXPIRED, expires_in_days=-3)
+    assert calculate_health_score(result).score == 100 - 5 - 3 - 10
+
+    result.ssl_cert_results = CertResult(CertStatus.ERROR, error="refused")
+    assert calculate_health_score(result).score == 100 - 5 - 3 - 5
+
+    result.ssl_cert_results = CertResult(CertStatus.VALID, expires_in_days=10)
+    assert calculate_health_score(result).score == 100 - 5 - 3 - 5
+
+
+def test_score_never_goes_below_zero():
+    result = CheckResult(
+        query="192.0.2.1",
+        is_ip=True,
+        blacklist_results={str(i): RBLResult(ListingStatus.LISTED) for i in range(12)},
+    )
+
+    assert calculate_health_score(result).score == 0
+
+
+def test_fastapi_copy_matches():
+    copy = os.path.join(HERE, os.pardir, os.pardir, "fastapi", "results.py")
+    if not os.path.exists(copy):
+        pytest.skip("fastapi service not checked out alongside")
+    with open(os.path.join(HERE, os.pardir, "results.py"), "rb") as original, open(copy, "rb") as vendored:
+        assert vendored.read() == original.read(), "fastapi/results.py must be an identical copy"
@@ -1,8 +1,9 @@
 # auth/utils.py
 from itsdangerous import URLSafeTimedSerializer
-from flask_mail import Message
 from flask import render_template
-from wsgi import app, mail
+from wsgi import app
+from models.user import db
+from models.outbox import OutboxMessage
 
 def get_serializer():
     return URLSafeTimedSerializer(app.config['SECRET_KEY'])
@@ -19,10 +20,12 @@ def verify_token(token, max_age=3600):
         return None
 
 def send_email(to, subject, template, **kwargs):
-    msg = Message(
-        subject,
-        recipients=[to],
+    # Queued in the caller's transaction; outbox.sender delivers it.
+    msg = OutboxMessage(
+        recipient=to,
+        subject=subject,
         sender=app.config['MAIL_DEFAULT_SENDER'],
         html=render_template(template, **kwargs)
     )
-    mail.send(msg)
\ No newline at end of file
+    db.session.add(msg)
+    return msg
\ No newline at end of file
@@ -0,0 +1 @@
+# billing/__init__.py
@@ -0,0 +1,185 @@
+# billing/metering.py
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, func, update
+
+from config.constants import (
+    BILLABLE_VM_STATUSES,
+    BILLING_PERIOD_SECONDS,
+    METERING_SAMPLE_SECONDS,
+    VM_COST_PER_HOUR,
+)
+from models.user import db, User, CreditLedger
+from openstack.client import get_openstack_connection
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def collect_usage_samples(conn=None):
+    # One paginated listing across all projects per sample, never a call per VM.
+    conn = conn or get_openstack_connection()
+    counts = Counter()
+    for server in conn.compute.servers(details=True, all_projects=True):
+        if server.status in BILLABLE_VM_STATUSES:
+            counts[server.project_id] += 1
+    return counts
+
+
+def period_bounds(at, period_seconds=BILLING_PERIOD_SECONDS):
+    # Periods are aligned to epoch boundaries so every process agrees on them.
+    elapsed = int((at - EPOCH).total_seconds())
+    start = EPOCH + timedelta(seconds=elapsed - elapsed % period_seconds)
+    return start, start + timedelta(seconds=period_seconds)
+
+
+class UsageMeter:
+    # Adds up VM-seconds per project in memory between billing boundaries.
+    # Each sample covers the time since the previous one, so a VM is charged
+    # for roughly the time it was seen running, not for whole hours.
+
+    def __init__(self, period_seconds=BILLING_PERIOD_SECONDS, max_gap_seconds=2 * METERING_SAMPLE_SECONDS):
+        self.period_seconds = period_seconds
+        # Longer gaps (OpenStack unreachable, process paused) are not billed.
+        self.max_gap_seconds = max_gap_seconds
+        self.period_start = None
+        self.period_end = None
+        self.last_sample_at = None
+        self.vm_seconds = Counter()
+        self.vm_count = Counter()
+        # Closed periods waiting to be written: (start, end, vm_seconds, vm_count).
+        self.unbilled = []
+
+    def _accrue(self, counts, seconds):
+        if seconds <= 0:
+            return
+        for project_id, count in counts.items():
+            self.vm_seconds[project_id] += count * seconds
+            self.vm_count[project_id] = max(self.vm_count[project_id], count)
+
+    def add_sample(self, counts, now):
+        if self.last_sample_at is None:
+            # Nothing is known about the time before the first sample.
+            self.period_start, self.period_end = period_bounds(now, self.period_seconds)
+            self.last_sample_at = now
+            return
+
+        since = max(self.last_sample_at, now - timedelta(seconds=self.max_gap_seconds))
+        while now >= self.period_end:
+            if since < self.period_end:
+                self._accrue(counts, int((self.period_end - since).total_seconds()))
+                since = self.period_end
+            self.unbilled.append((self.period_start, self.period_end, self.vm_seconds, self.vm_count))
+            self.vm_seconds, self.vm_count = Counter(), Counter()
+            self.period_start = self.period_end
+            self.period_end = self.period_start + timedelta(seconds=self.period_seconds)
+        self._accrue(counts, int((now - since).total_seconds()))
+        self.last_sample_at = now
+
+
+def aggregate_usage(vm_seconds, vm_count):
+    if not vm_seconds:
+        return {}
+
+    users = (
+        db.session.query(User.id, User.openstack_project_id)
+        .filter(User.openstack_project_id.in_(list(vm_seconds)))
+        .all()
+    )
+
+    deltas = {}
+    for user_id, project_id in users:
+        seconds = vm_seconds[project_id]
+        deltas[user_id] = {
+            "vm_count": vm_count[project_id],
+            "vm_seconds": seconds,
+            "amount": seconds * VM_COST_PER_HOUR // 3600,
+        }
+    return deltas
+
+
+def apply_usage(deltas, period_start, period_end):
+    if not deltas:
+        return 0
+
+    ledger_rows = [
+        {
+            "user_id": user_id,
+            "period_start": period_start,
+            "period_end": period_end,
+            "vm_count": delta["vm_count"],
+            "vm_seconds": delta["vm_seconds"],
+            "amount": delta["amount"],
+        }
+        for user_id, delta in deltas.items()
+    ]
+    credit_rows = [
+        {"uid": user_id, "amount": delta["amount"]}
+        for user_id, delta in deltas.items()
+        if delta["amount"]
+    ]
+
+    users = User.__table__
+    try:
+        db.session.execute(CreditLedger.__table__.insert(), ledger_rows)
+        if credit_rows:
+            db.session.execute(
+                update(users)
+                .where(users.c.id == bindparam("uid"))
+                .values(credits=users.c.credits - bindparam("amount")),
+                credit_rows,
+            )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise e
+    return len(ledger_rows)
+
+
+def period_billed(period_end):
+    # Guards against a second metering process charging the same period; the
+    # (user_id, period_start) unique constraint backs this up.
+    last_end = db.session.query(func.max(CreditLedger.period_end)).scalar()
+    return last_end is not None and last_end >= period_end
+
+
+def bill_period(period_start, period_end, vm_seconds, vm_count):
+    if period_billed(period_end):
+        return 0
+    deltas = aggregate_usage(vm_seconds, vm_count)
+    return apply_usage(deltas, period_start, period_end)
+
+
+def run_metering_cycle(meter, conn=None, now=None):
+    meter.add_sample(collect_usage_samples(conn), now or datetime.utcnow())
+    billed = 0
+    # A period stays queued until its write succeeds.
+    while meter.unbilled:
+        billed += bill_period(*meter.unbilled[0])
+        meter.unbilled.pop(0)
+    return billed
+
+
+def run_forever(app, sample_seconds=METERING_SAMPLE_SECONDS):
+    conn = get_openstack_connection()
+    meter = UsageMeter()
+    while True:
+        try:
+            with app.app_context():
+                billed = run_metering_cycle(meter, conn)
+            if billed:
+                print(f"💳 Metered {billed} users.")
+        except Exception as e:
+            print(f"❌ Metering cycle failed: {e}")
+        # Wake just after the next sample boundary; billing boundaries are multiples of it.
+        time.sleep(sample_seconds - time.time() % sample_seconds + 1)
+
+
+if __name__ == "__main__":
+    from wsgi import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    run_forever(app)
@@ -3,4 +3,7 @@ FREE_CREDITS = 100
 VM_COST_PER_HOUR = 10
 DEFAULT_VM_QUOTA = 5
 DEFAULT_RAM_GB = 16
-DEFAULT_DISK_GB = 100
\ No newline at end of file
+DEFAULT_DISK_GB = 100
+BILLING_PERIOD_SECONDS = 3600
+METERING_SAMPLE_SECONDS = 300
+BILLABLE_VM_STATUSES = ("ACTIVE",)
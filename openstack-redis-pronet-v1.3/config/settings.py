@@ -16,11 +16,18 @@ class Config:
 
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
-    MAIL_USE_TLS = True
+    MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "True").lower() in ("1", "true", "yes")
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_USERNAME")
 
+    MAIL_OUTBOX_WORKERS = int(os.getenv("MAIL_OUTBOX_WORKERS", 2))
+    MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 20))
+    MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
+    MAIL_RETRY_BASE_SECONDS = int(os.getenv("MAIL_RETRY_BASE_SECONDS", 30))
+    MAIL_POLL_SECONDS = int(os.getenv("MAIL_POLL_SECONDS", 2))
+
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
     OAUTHLIB_RELAX_TOKEN_SCOPE = os.getenv("OAUTHLIB_RELAX_TOKEN_SCOPE", "1")
@@ -28,4 +35,8 @@ class Config:
 
     OPENSTACK_CLOUD = "openstack"
 
+    USAGE_REDIS = f"redis://{os.getenv('REDIS_HOST', '192.168.0.207')}:6379/1"
+    USAGE_REFRESH_SECONDS = int(os.getenv("USAGE_REFRESH_SECONDS", 60))
+    USAGE_STALE_SECONDS = int(os.getenv("USAGE_STALE_SECONDS", 300))
+
     APP_NAME = "CloudLab"
\ No newline at end of file
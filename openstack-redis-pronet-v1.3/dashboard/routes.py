@@ -1,13 +1,26 @@
 # dashboard/routes.py
-from flask import Blueprint, render_template
+from flask import Blueprint, render_template, jsonify, current_app
 from flask_login import login_required, current_user
+from openstack.quota import get_usage_store, get_usage_snapshot
 
 dashboard = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
+def current_usage():
+    return get_usage_snapshot(
+        get_usage_store(current_app),
+        current_user.openstack_project_id,
+        stale_after=current_app.config['USAGE_STALE_SECONDS'],
+    )
+
 @dashboard.route('/')
 @login_required
 def dashboard():
-    return render_template('sidebar3.html', user=current_user)
+    return render_template('sidebar3.html', user=current_user, usage=current_usage())
+
+@dashboard.route('/usage')
+@login_required
+def usage():
+    return jsonify(current_usage())
 
 @dashboard.route('/profile')
 @login_required
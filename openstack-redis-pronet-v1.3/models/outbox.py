@@ -0,0 +1,23 @@
+# models/outbox.py
+from datetime import datetime
+from models.user import db
+
+class OutboxMessage(db.Model):
+    __tablename__ = "outbox_message"
+
+    id = db.Column(db.Integer, primary_key=True)
+    sender = db.Column(db.String(120), nullable=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+
+    status = db.Column(db.String(16), nullable=False, default="pending", index=True)
+    claim_token = db.Column(db.String(32), nullable=True, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.recipient} {self.status}>"
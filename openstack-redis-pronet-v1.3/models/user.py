@@ -36,4 +36,22 @@ class OAuth(db.Model):
     provider_user_id = db.Column(db.String(256), unique=True, nullable=False)
     token = db.Column(db.Text, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    user = db.relationship("User", backref=db.backref("oauth", lazy=True))
\ No newline at end of file
+    user = db.relationship("User", backref=db.backref("oauth", lazy=True))
+
+class CreditLedger(db.Model):
+    __tablename__ = "credit_ledger"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "period_start", name="uq_credit_ledger_user_period"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    period_start = db.Column(db.DateTime, nullable=False)
+    period_end = db.Column(db.DateTime, nullable=False)
+    vm_count = db.Column(db.Integer, nullable=False, default=0)
+    vm_seconds = db.Column(db.Integer, nullable=False, default=0)
+    amount = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CreditLedger user={self.user_id} amount={self.amount}>"
@@ -0,0 +1,142 @@
+# openstack/quota.py
+import json
+import time
+from collections import defaultdict
+
+import redis
+
+from openstack.client import get_openstack_connection
+
+SNAPSHOT_KEY = "usage:snapshots"
+REFRESHED_KEY = "usage:refreshed_at"
+EMPTY_USAGE = {
+    "vms": 0,
+    "vcpus": 0,
+    "ram_mb": 0,
+    "disk_gb": 0,
+    "volumes": 0,
+    "volume_gb": 0,
+    "floating_ips": 0,
+    "networks": 0,
+}
+
+_redis = None
+
+
+def get_usage_store(app):
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(app.config['USAGE_REDIS'])
+    return _redis
+
+
+def collect_project_usage(conn=None, project_id=None):
+    # One listing per resource type across all projects, regardless of project count.
+    # project_id narrows every listing to one project for a live quota check.
+    conn = conn or get_openstack_connection()
+    usage = defaultdict(lambda: dict(EMPTY_USAGE))
+    flavors = {f.id: f for f in conn.compute.flavors(details=True)}
+    scope = {"project_id": project_id} if project_id else {}
+
+    for server in conn.compute.servers(details=True, all_projects=True, **scope):
+        u = usage[server.project_id]
+        flavor = server.flavor
+        if not getattr(flavor, "ram", None):
+            flavor = flavors.get(getattr(flavor, "id", None))
+        u["vms"] += 1
+        if flavor:
+            u["vcpus"] += flavor.vcpus or 0
+            u["ram_mb"] += flavor.ram or 0
+            u["disk_gb"] += flavor.disk or 0
+
+    for volume in conn.block_storage.volumes(details=True, all_projects=True, **scope):
+        u = usage[volume.project_id]
+        u["volumes"] += 1
+        u["volume_gb"] += volume.size or 0
+        u["disk_gb"] += volume.size or 0
+
+    for ip in conn.network.ips(**scope):
+        usage[ip.project_id]["floating_ips"] += 1
+
+    for network in conn.network.networks(**scope):
+        usage[network.project_id]["networks"] += 1
+
+    usage.pop(None, None)
+    return dict(usage)
+
+
+def refresh_usage_snapshots(store, conn=None):
+    usage = collect_project_usage(conn)
+    now = int(time.time())
+    mapping = {
+        project_id: json.dumps(u, separators=(",", ":"))
+        for project_id, u in usage.items()
+    }
+    pipe = store.pipeline(transaction=True)
+    pipe.delete(SNAPSHOT_KEY)
+    if mapping:
+        pipe.hset(SNAPSHOT_KEY, mapping=mapping)
+    pipe.set(REFRESHED_KEY, now)
+    pipe.execute()
+    return len(mapping)
+
+
+def get_usage_snapshot(store, project_id, stale_after=300):
+    raw, refreshed_at = store.pipeline().hget(SNAPSHOT_KEY, project_id or "").get(REFRESHED_KEY).execute()
+    usage = json.loads(raw) if raw else dict(EMPTY_USAGE)
+    if refreshed_at is None:
+        usage.update(refreshed_at=None, age_seconds=None, stale=True)
+        return usage
+    refreshed_at = int(refreshed_at)
+    age = max(0, int(time.time()) - refreshed_at)
+    usage.update(refreshed_at=refreshed_at, age_seconds=age, stale=age > stale_after)
+    return usage
+
+
+def check_quota(user, usage, vms=1, ram_gb=0, disk_gb=0):
+    # A missing or stale snapshot reads as zero usage, so it must never pass.
+    if usage.get("stale", True):
+        return ["Usage data is not available right now. Please try again shortly."]
+
+    errors = []
+    if usage["vms"] + vms > user.vm_quota:
+        errors.append(f"VM quota exceeded ({usage['vms']}/{user.vm_quota}).")
+    if usage["ram_mb"] + ram_gb * 1024 > user.ram_quota_gb * 1024:
+        errors.append(f"RAM quota exceeded ({usage['ram_mb'] // 1024}/{user.ram_quota_gb} GB).")
+    if usage["disk_gb"] + disk_gb > user.disk_quota_gb:
+        errors.append(f"Disk quota exceeded ({usage['disk_gb']}/{user.disk_quota_gb} GB).")
+    return errors
+
+
+def enforce_quota(store, user, vms=1, ram_gb=0, disk_gb=0, conn=None, stale_after=300):
+    # Call before conn.compute.create_server() when creating a VM; refuse if the
+    # returned list is non-empty. The cached snapshot is used while fresh,
+    # otherwise the user's project is counted live.
+    usage = get_usage_snapshot(store, user.openstack_project_id, stale_after=stale_after)
+    if usage["stale"] and user.openstack_project_id:
+        try:
+            live = collect_project_usage(conn, project_id=user.openstack_project_id)
+            usage = dict(live.get(user.openstack_project_id, EMPTY_USAGE), stale=False)
+        except Exception as e:
+            print(f"❌ Live usage check failed: {e}")
+    return check_quota(user, usage, vms=vms, ram_gb=ram_gb, disk_gb=disk_gb)
+
+
+def run_forever(app):
+    store = get_usage_store(app)
+    conn = get_openstack_connection()
+    interval = app.config['USAGE_REFRESH_SECONDS']
+    while True:
+        started = time.monotonic()
+        try:
+            count = refresh_usage_snapshots(store, conn)
+            print(f"📊 Refreshed usage for {count} projects.")
+        except Exception as e:
+            print(f"❌ Usage refresh failed: {e}")
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    from wsgi import create_app
+
+    run_forever(create_app())
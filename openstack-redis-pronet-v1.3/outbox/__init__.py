@@ -0,0 +1 @@
+# outbox/__init__.py
@@ -0,0 +1,74 @@
+# outbox/pool.py
+import queue
+import smtplib
+
+
+class SMTPConnectionPool:
+    def __init__(self, host, port, use_tls=False, username=None, password=None,
+                 size=2, max_messages=100, timeout=30):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        conn.ehlo()
+        if self.use_tls:
+            conn.starttls()
+            conn.ehlo()
+        if self.username and self.password:
+            conn.login(self.username, self.password)
+        conn.sent_count = 0
+        return conn
+
+    def acquire(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except smtplib.SMTPException:
+                pass
+            self._close(conn)
+
+    def release(self, conn, broken=False):
+        if broken or conn.sent_count >= self.max_messages:
+            self._close(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._close(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config['MAIL_SERVER'],
+            config['MAIL_PORT'],
+            use_tls=config.get('MAIL_USE_TLS', False),
+            username=config.get('MAIL_USERNAME'),
+            password=config.get('MAIL_PASSWORD'),
+            size=config.get('MAIL_POOL_SIZE', 2),
+        )
@@ -0,0 +1,184 @@
+# outbox/sender.py
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from models.user import db
+from models.outbox import OutboxMessage
+from outbox.pool import SMTPConnectionPool
+
+MAX_BACKOFF_SECONDS = 3600
+STUCK_AFTER_SECONDS = 600
+STUCK_CHECK_SECONDS = 60
+
+
+def build_message(row):
+    msg = EmailMessage()
+    msg['Subject'] = row.subject
+    msg['From'] = row.sender
+    msg['To'] = row.recipient
+    msg.set_content("This message requires an HTML capable mail client.")
+    msg.add_alternative(row.html, subtype='html')
+    return msg
+
+
+def claim_batch(batch_size):
+    # The conditional UPDATE is the claim: a row another worker already took is
+    # no longer "pending", so only rows stamped with our token are returned.
+    candidates = (
+        db.session.query(OutboxMessage.id)
+        .filter(OutboxMessage.status == "pending",
+                OutboxMessage.next_attempt_at <= datetime.utcnow())
+        .order_by(OutboxMessage.next_attempt_at)
+        .limit(batch_size)
+        .all()
+    )
+    if not candidates:
+        return []
+
+    token = uuid.uuid4().hex
+    OutboxMessage.query.filter(
+        OutboxMessage.id.in_([c.id for c in candidates]),
+        OutboxMessage.status == "pending",
+    ).update({
+        "status": "sending",
+        "claim_token": token,
+        "next_attempt_at": datetime.utcnow(),
+    }, synchronize_session=False)
+    db.session.commit()
+    return OutboxMessage.query.filter_by(status="sending", claim_token=token).all()
+
+
+def schedule_retry(row, error, max_attempts, base_seconds):
+    row.attempts += 1
+    row.last_error = str(error)[:1000]
+    if row.attempts >= max_attempts:
+        row.status = "failed"
+        return
+    delay = min(base_seconds * 2 ** (row.attempts - 1), MAX_BACKOFF_SECONDS)
+    row.status = "pending"
+    row.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+
+def requeue(row, error, delay_seconds=0):
+    # The message was never handed to the server, so it doesn't cost an attempt.
+    row.status = "pending"
+    row.claim_token = None
+    row.last_error = str(error)[:1000]
+    row.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+
+
+def deliver_batch(pool, rows, max_attempts, base_seconds):
+    if not rows:
+        return 0
+
+    try:
+        conn = pool.acquire()
+    except (smtplib.SMTPException, OSError) as e:
+        for row in rows:
+            requeue(row, e, base_seconds)
+        db.session.commit()
+        return 0
+
+    sent = 0
+    broken = False
+    completed = False
+    try:
+        for row in rows:
+            if broken:
+                requeue(row, "connection lost before sending")
+                continue
+            try:
+                conn.send_message(build_message(row))
+                conn.sent_count += 1
+                row.status = "sent"
+                row.sent_at = datetime.utcnow()
+                sent += 1
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                broken = True
+                schedule_retry(row, e, max_attempts, base_seconds)
+            except smtplib.SMTPException as e:
+                schedule_retry(row, e, max_attempts, base_seconds)
+        db.session.commit()
+        completed = True
+    finally:
+        # Anything unexpected leaves the rows in "sending"; release_stuck requeues them.
+        if not completed:
+            db.session.rollback()
+        pool.release(conn, broken=broken or not completed)
+    return sent
+
+
+def release_stuck(older_than_seconds=STUCK_AFTER_SECONDS):
+    # Rows left in "sending" by a failed batch or a crashed worker go back to the queue.
+    cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
+    OutboxMessage.query.filter(
+        OutboxMessage.status == "sending",
+        OutboxMessage.next_attempt_at <= cutoff,
+    ).update({"status": "pending", "claim_token": None}, synchronize_session=False)
+    db.session.commit()
+
+
+def drain(app, pool=None):
+    config = app.config
+    pool = pool or SMTPConnectionPool.from_config(config)
+    total = 0
+    with app.app_context():
+        while True:
+            rows = claim_batch(config.get('MAIL_BATCH_SIZE', 20))
+            if not rows:
+                return total
+            total += deliver_batch(
+                pool, rows,
+                config.get('MAIL_MAX_ATTEMPTS', 5),
+                config.get('MAIL_RETRY_BASE_SECONDS', 30),
+            )
+
+
+def worker_loop(app, pool, stop_event):
+    poll_seconds = app.config.get('MAIL_POLL_SECONDS', 2)
+    next_stuck_check = 0
+    while not stop_event.is_set():
+        try:
+            if time.monotonic() >= next_stuck_check:
+                with app.app_context():
+                    release_stuck()
+                next_stuck_check = time.monotonic() + STUCK_CHECK_SECONDS
+            sent = drain(app, pool)
+        except Exception as e:
+            print(f"❌ Outbox worker error: {e}")
+            sent = 0
+        if not sent:
+            stop_event.wait(poll_seconds)
+
+
+def start_workers(app, stop_event=None):
+    stop_event = stop_event or threading.Event()
+    pool = SMTPConnectionPool.from_config(app.config)
+    threads = []
+    for i in range(app.config.get('MAIL_OUTBOX_WORKERS', 2)):
+        t = threading.Thread(target=worker_loop, args=(app, pool, stop_event),
+                             name=f"outbox-{i}", daemon=True)
+        t.start()
+        threads.append(t)
+    return pool, threads, stop_event
+
+
+if __name__ == "__main__":
+    from wsgi import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    pool, threads, stop_event = start_workers(app)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for t in threads:
+            t.join()
+        pool.close_all()
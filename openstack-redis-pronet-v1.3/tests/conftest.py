@@ -0,0 +1,30 @@
+# tests/conftest.py
+import os
+import sys
+import types
+
+import pytest
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# config.py at the project root shadows the config/ directory, which has no
+# __init__.py; register the directory as the package so config.* imports work.
+config = types.ModuleType("config")
+config.__path__ = [os.path.join(ROOT, "config")]
+sys.modules["config"] = config
+
+from models.user import db
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,119 @@
+# tests/test_metering.py
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from billing.metering import UsageMeter, apply_usage, period_bounds, period_billed, run_metering_cycle
+from models.user import db, User, CreditLedger
+
+HOUR = datetime(2024, 1, 1, 10)
+
+
+def minutes(n):
+    return HOUR + timedelta(minutes=n)
+
+
+class FakeCompute:
+    def __init__(self):
+        self.servers_by_project = {}
+
+    def servers(self, details=True, all_projects=True):
+        return [
+            SimpleNamespace(project_id=project_id, status="ACTIVE")
+            for project_id, count in self.servers_by_project.items()
+            for _ in range(count)
+        ]
+
+
+def add_user(project_id, credits=100):
+    user = User(email=f"{project_id}@cloudlab.test", openstack_project_id=project_id, credits=credits)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_period_bounds_align_to_the_hour():
+    assert period_bounds(minutes(59)) == (HOUR, minutes(60))
+    assert period_bounds(minutes(60)) == (minutes(60), minutes(120))
+
+
+def test_vm_running_inside_one_hour_is_billed_for_the_time_seen():
+    meter = UsageMeter()
+    meter.add_sample({}, minutes(0))
+    for m in range(5, 60, 5):
+        meter.add_sample({"p1": 1} if 5 < m <= 55 else {}, minutes(m))
+    meter.add_sample({}, minutes(60))
+
+    assert len(meter.unbilled) == 1
+    start, end, vm_seconds, vm_count = meter.unbilled[0]
+    assert (start, end) == (HOUR, minutes(60))
+    assert vm_seconds["p1"] == 50 * 60
+    assert vm_count["p1"] == 1
+
+
+def test_first_sample_and_long_gaps_are_not_billed():
+    meter = UsageMeter(max_gap_seconds=600)
+    meter.add_sample({"p1": 2}, minutes(59))
+    meter.add_sample({"p1": 2}, minutes(61))
+    meter.add_sample({"p1": 1}, minutes(100))
+
+    (_, _, vm_seconds, _), = meter.unbilled
+    assert vm_seconds["p1"] == 2 * 60
+    assert meter.vm_seconds["p1"] == 2 * 60 + 600
+
+
+def test_apply_usage_writes_ledger_and_debits_credits(app):
+    a, b = add_user("p1"), add_user("p2")
+    deltas = {
+        a.id: {"vm_count": 2, "vm_seconds": 7200, "amount": 20},
+        b.id: {"vm_count": 1, "vm_seconds": 60, "amount": 0},
+    }
+
+    assert apply_usage(deltas, HOUR, minutes(60)) == 2
+    assert db.session.get(User, a.id).credits == 80
+    assert db.session.get(User, b.id).credits == 100
+    assert CreditLedger.query.count() == 2
+    assert period_billed(minutes(60))
+    assert not period_billed(minutes(120))
+
+
+def test_period_is_billed_once(app):
+    user = add_user("p1")
+    compute = FakeCompute()
+    conn = SimpleNamespace(compute=compute)
+    compute.servers_by_project = {"p1": 2}
+
+    meter = UsageMeter()
+    for m in range(0, 65, 5):
+        run_metering_cycle(meter, conn, now=minutes(m))
+    assert db.session.get(User, user.id).credits == 100 - 20
+
+    # A second meter replaying the same hour must not charge it again.
+    other = UsageMeter()
+    for m in range(0, 65, 5):
+        assert run_metering_cycle(other, conn, now=minutes(m)) == 0
+    assert db.session.get(User, user.id).credits == 100 - 20
+    assert CreditLedger.query.count() == 1
+    assert not other.unbilled
+
+
+def test_failed_write_keeps_the_period_queued(app, monkeypatch):
+    user = add_user("p1")
+    conn = SimpleNamespace(compute=FakeCompute())
+    conn.compute.servers_by_project = {"p1": 1}
+    meter = UsageMeter()
+    for m in range(0, 60, 5):
+        run_metering_cycle(meter, conn, now=minutes(m))
+
+    def fail(*args):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr("billing.metering.apply_usage", fail)
+    with pytest.raises(RuntimeError):
+        run_metering_cycle(meter, conn, now=minutes(60))
+    assert len(meter.unbilled) == 1
+
+    monkeypatch.undo()
+    assert run_metering_cycle(meter, conn, now=minutes(65)) == 1
+    assert db.session.get(User, user.id).credits == 100 - 10
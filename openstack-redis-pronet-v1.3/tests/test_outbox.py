@@ -0,0 +1,90 @@
+# tests/test_outbox.py
+import smtplib
+
+import pytest
+
+from models.user import db
+from models.outbox import OutboxMessage
+from outbox.pool import SMTPConnectionPool
+from outbox.sender import claim_batch, deliver_batch
+from outbox.sink import SMTPSink
+
+
+@pytest.fixture
+def sink():
+    with SMTPSink() as sink:
+        yield sink
+
+
+def queue_messages(count):
+    for i in range(count):
+        db.session.add(OutboxMessage(
+            sender="noreply@cloudlab.test",
+            recipient=f"user{i}@cloudlab.test",
+            subject=f"Message {i}",
+            html=f"<p>Hello {i}</p>",
+        ))
+    db.session.commit()
+
+
+def test_batch_is_sent_over_one_pooled_connection(app, sink):
+    queue_messages(3)
+    pool = SMTPConnectionPool("127.0.0.1", sink.port, size=1)
+
+    sent = deliver_batch(pool, claim_batch(10), max_attempts=3, base_seconds=1)
+    pool.close_all()
+
+    assert sent == 3
+    assert len(sink.messages) == 3
+    assert len(sink.connections) == 1
+    assert {m["to"][0] for m in sink.messages} == {f"user{i}@cloudlab.test" for i in range(3)}
+    assert OutboxMessage.query.filter_by(status="sent").count() == 3
+
+
+def test_claimed_rows_are_not_claimed_again(app):
+    queue_messages(2)
+
+    assert len(claim_batch(10)) == 2
+    assert claim_batch(10) == []
+
+
+def test_unexpected_error_releases_connection(app, sink, monkeypatch):
+    queue_messages(2)
+    pool = SMTPConnectionPool("127.0.0.1", sink.port, size=1)
+    released = []
+    monkeypatch.setattr(pool, "release", lambda conn, broken=False: released.append(broken))
+    monkeypatch.setattr("outbox.sender.build_message", lambda row: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        deliver_batch(pool, claim_batch(10), max_attempts=3, base_seconds=1)
+
+    assert released == [True]
+    assert OutboxMessage.query.filter_by(status="sending").count() == 2
+
+
+def test_rows_after_a_broken_connection_keep_their_attempts(app):
+    queue_messages(3)
+
+    class DroppingConnection:
+        sent_count = 0
+
+        def send_message(self, message):
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+    class FakePool:
+        def acquire(self):
+            return DroppingConnection()
+
+        def release(self, conn, broken=False):
+            self.broken = broken
+
+    pool = FakePool()
+    rows = claim_batch(10)
+    assert deliver_batch(pool, rows, max_attempts=3, base_seconds=1) == 0
+    assert pool.broken
+
+    first, *rest = sorted(rows, key=lambda row: row.id)
+    assert first.attempts == 1
+    assert [row.attempts for row in rest] == [0, 0]
+    assert all(row.status == "pending" and row.claim_token is None for row in rest)
+    assert {row.id for row in claim_batch(10)} == {row.id for row in rest}